@@ -0,0 +1,178 @@
+"""Shared helpers used by the morning and evening call scripts."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+import httpx
+from vapi import Vapi
+
+# orjson is listed in requirements.txt, but cron's `git pull` can deliver this
+# code before the container reinstalls dependencies, so stay importable without it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from obsidian_git_sync import ObsidianGitSync, ObsidianSync
+from vapi_polling import CALL_FETCH_WORKERS, parse_vapi_datetime
+
+# Timeout (seconds) applied to every Vapi API request.
+VAPI_TIMEOUT_SECONDS = 30.0
+
+# Obsidian sync settings, read once when a script starts.
+OBSIDIAN_ENABLED = os.environ.get("OBSIDIAN_ENABLED", "false").lower() == "true"
+OBSIDIAN_REPO_URL = os.environ.get("OBSIDIAN_REPO_URL")
+OBSIDIAN_GITHUB_TOKEN = os.environ.get("OBSIDIAN_GITHUB_TOKEN")
+
+
+def _decode_json_with_orjson(response: httpx.Response) -> None:
+    """Response hook: make ``response.json()`` (used by the SDK) decode via orjson."""
+    response.json = lambda **kwargs: orjson.loads(response.content)
+
+
+def create_vapi_client(token: str) -> Vapi:
+    """Create the Vapi client for a script run on a single keep-alive connection pool.
+
+    Every request of the run (list, concurrent gets, assistant update, call
+    creation) reuses the pooled TCP/TLS connections instead of reconnecting.
+    When available, orjson decodes the responses, which is noticeably cheaper
+    for call lists carrying full artifacts and transcripts.
+    """
+    event_hooks = {"response": [_decode_json_with_orjson]} if orjson else {}
+    http_client = httpx.Client(
+        timeout=VAPI_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=CALL_FETCH_WORKERS),
+        event_hooks=event_hooks,
+    )
+    return Vapi(token=token, httpx_client=http_client)
+
+
+def place_call(
+    client: object,
+    *,
+    assistant_id: str,
+    phone_number_id: str,
+    target_number: str,
+    label: str,
+    skip: bool = False,
+) -> Optional[object]:
+    """Create an outbound call with the given assistant and print its details.
+
+    Returns the created call, or ``None`` when ``skip`` is set (the
+    ``VAPI_SKIP_OUTBOUND_CALL`` testing switch).
+    """
+    if skip:
+        print(f"VAPI_SKIP_OUTBOUND_CALL=true; skipping outbound {label} call creation for testing.")
+        return None
+
+    call = client.calls.create(
+        assistant_id=assistant_id,
+        phone_number_id=phone_number_id,
+        customer={"number": target_number},
+    )
+
+    print(f"\n{label.capitalize()} call initiated successfully!")
+    print(f"Call ID: {call.id}")
+    print(f"Status: {call.status}")
+    print(f"Calling: {target_number}")
+    return call
+
+
+def call_timestamp(call: object) -> datetime:
+    """Return when a call ended (or started), falling back to the current UTC time."""
+    return (
+        parse_vapi_datetime(getattr(call, "ended_at", None))
+        or parse_vapi_datetime(getattr(call, "started_at", None))
+        or datetime.now(timezone.utc)
+    )
+
+
+def obsidian_repository(label: str) -> Optional[Tuple[str, str]]:
+    """Return the vault repository URL and token when Obsidian sync is enabled.
+
+    Prints why the sync is skipped and returns ``None`` otherwise.
+    """
+    if not OBSIDIAN_ENABLED:
+        print(f"Obsidian sync disabled; skipping {label} vault update.")
+        return None
+
+    if not OBSIDIAN_REPO_URL or not OBSIDIAN_GITHUB_TOKEN:
+        print("Obsidian sync requested but repository URL or token missing; skipping.")
+        return None
+
+    return OBSIDIAN_REPO_URL, OBSIDIAN_GITHUB_TOKEN
+
+
+class VaultClone:
+    """Clone the Obsidian vault on a worker thread while the caller keeps working.
+
+    Started before polling Vapi, so the clone overlaps the wait for the
+    structured output instead of following it. Use as a context manager: the
+    temporary checkout is removed on exit whether or not it was synced.
+    """
+
+    def __init__(self, repository: Tuple[str, str]) -> None:
+        repo_url, github_token = repository
+        self.git_sync = ObsidianGitSync(repo_url, github_token)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._clone = executor.submit(self.git_sync.clone_repo)
+        executor.shutdown(wait=False)
+
+    def __enter__(self) -> "VaultClone":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def wait(self) -> ObsidianGitSync:
+        """Block until the clone finishes, re-raising any clone failure."""
+        self._clone.result()
+        return self.git_sync
+
+    def close(self) -> None:
+        """Let a running clone finish, then remove the temporary checkout."""
+        self._clone.exception()
+        self.git_sync.cleanup()
+
+
+def sync_to_obsidian(
+    vault: VaultClone,
+    update: Callable[[ObsidianSync], object],
+    *,
+    label: str,
+    success_message: str,
+) -> bool:
+    """Apply ``update`` to the cloned vault and push the result.
+
+    Failures are reported rather than raised so a broken vault never aborts
+    the call flow. Returns ``True`` when the update completed.
+    """
+    try:
+        git_sync = vault.wait()
+        obsidian = ObsidianSync(str(git_sync.vault_path), git_sync=git_sync)
+        update(obsidian)
+        print(success_message)
+        return True
+    except Exception as exc:
+        print(f"Obsidian {label} sync failed: {exc}")
+        return False
+    finally:
+        vault.close()
+
+
+__all__ = [
+    "OBSIDIAN_ENABLED",
+    "OBSIDIAN_GITHUB_TOKEN",
+    "OBSIDIAN_REPO_URL",
+    "call_timestamp",
+    "create_vapi_client",
+    "obsidian_repository",
+    "place_call",
+    "sync_to_obsidian",
+    "VaultClone",
+]
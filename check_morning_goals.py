@@ -1,25 +1,37 @@
 import os
-from vapi import Vapi
+
+from accountability_core import create_vapi_client
+from vapi_polling import fetch_calls, iter_candidate_calls, structured_outputs_of
 
 # Load environment variables
 VAPI_API_TOKEN = os.environ.get("VAPI_API_TOKEN")
 MORNING_ASSISTANT_ID = os.environ.get("MORNING_ASSISTANT_ID")
 TARGET_PHONE_NUMBER = os.environ.get("TARGET_PHONE_NUMBER")
+PHONE_NUMBER_ID = os.environ.get("PHONE_NUMBER_ID")  # optional; narrows the listing
 
 # Validate required environment variables
 if not all([VAPI_API_TOKEN, MORNING_ASSISTANT_ID, TARGET_PHONE_NUMBER]):
     raise ValueError("Missing required environment variables. Please check .env file.")
 
-client = Vapi(token=VAPI_API_TOKEN)
+client = create_vapi_client(VAPI_API_TOKEN)
 
-# Get list of all calls
-calls_list = client.calls.list()
+# Page through the most recent calls placed by the morning assistant, newest first
+calls_list = iter_candidate_calls(
+    client,
+    assistant_id=MORNING_ASSISTANT_ID,
+    phone_number_id=PHONE_NUMBER_ID,
+)
 
 # Filter for calls to target number that were successful and from specific assistant
 target_number = TARGET_PHONE_NUMBER
 target_assistant_id = MORNING_ASSISTANT_ID
 successful_calls = []
+call_with_outputs = None
+calls_missing_artifact = []
 
+# The list payload normally carries the artifact already, so stop paging at the
+# first successful call with structured outputs. Of the calls listed before it,
+# only those listed without an artifact can gain outputs from a full fetch.
 for call in calls_list:
     # Check if call has customer info and matches our number
     if hasattr(call, 'customer') and call.customer:
@@ -30,19 +42,19 @@ for call in calls_list:
             call.status == 'ended' and
             call.assistant_id == target_assistant_id):
             successful_calls.append(call)
+            if structured_outputs_of(call):
+                call_with_outputs = call
+                break
+            if getattr(call, "artifact", None) is None:
+                calls_missing_artifact.append(call)
 
 if not successful_calls:
     print(f"No successful calls found for {target_number}")
 else:
-    # Search through calls to find one with structured outputs
-    call_with_outputs = None
-
-    for call in successful_calls:
-        # Fetch full call details
-        full_call = client.calls.get(id=call.id)
-
+    # Fetch full call details for the remaining candidates at once rather than one by one
+    for full_call in fetch_calls(client, [call.id for call in calls_missing_artifact]):
         # Check if it has structured outputs
-        if hasattr(full_call, 'artifact') and full_call.artifact and hasattr(full_call.artifact, 'structured_outputs') and full_call.artifact.structured_outputs:
+        if structured_outputs_of(full_call):
             call_with_outputs = full_call
             break
 
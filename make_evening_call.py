@@ -1,15 +1,22 @@
 import os
+import re
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
-from vapi import Vapi
-
-from obsidian_git_sync import ObsidianGitSync, ObsidianSync, parse_goals_from_vapi_output
+from accountability_core import (
+    VaultClone,
+    call_timestamp,
+    create_vapi_client,
+    obsidian_repository,
+    place_call,
+    sync_to_obsidian,
+)
+from obsidian_git_sync import parse_goals_from_vapi_output
 from vapi_polling import (
     cron_reference_time,
     find_structured_call,
     load_polling_configuration,
-    parse_vapi_datetime,
+    structured_outputs_of,
     wait_for_structured_output,
 )
 
@@ -35,13 +42,18 @@ if not all(
 ):
     raise ValueError("Missing required environment variables. Please check .env file.")
 
-client = Vapi(token=VAPI_API_TOKEN)
+client = create_vapi_client(VAPI_API_TOKEN)
 
 poll_interval, timeout_delta, tolerance_delta = load_polling_configuration()
 
+# Case-insensitive markers used when scanning evening structured outputs.
+_REFLECTION_RE = re.compile(r"reflection", re.IGNORECASE)
+_COMPLETE_RE = re.compile(r"complete|\[x\]", re.IGNORECASE)
 
-def _build_evening_prompt(goals_text: str) -> str:
-    return f"""Accountability Buddy AI - System Prompt
+
+# Static evening prompt text surrounding the morning goals; only the goals
+# list changes between runs.
+_EVENING_PROMPT_PREFIX = """Accountability Buddy AI - System Prompt
 You are a supportive accountability buddy conducting brief daily check-ins via voice call. Your goal is to help users set intentions in the morning and reflect on progress in the evening.
 Evening Call:
 
@@ -49,7 +61,9 @@ You will be provided with a numbered list of goals the user set this morning
 below.
 
 Morning Goals:
-{goals_text}
+"""
+
+_EVENING_PROMPT_SUFFIX = """
 
 Start with: "Hey, checking in! What are the things you accomplished today?"
 As they share, mentally reference the morning list to see what they completed
@@ -68,92 +82,102 @@ Brief and respectful of their time
 Non-judgmental about setbacks"""
 
 
-def _parse_evening_results(
-    structured_outputs: Dict[str, object],
-    goals: List[str],
-) -> Tuple[List[bool], str]:
-    """Derive completion booleans and reflections text from Vapi structured output."""
-    completed = [False] * len(goals)
-    reflections = ""
+def _build_evening_prompt(goals_text: str) -> str:
+    return _EVENING_PROMPT_PREFIX + goals_text + _EVENING_PROMPT_SUFFIX
 
-    if not structured_outputs:
-        return completed, reflections
 
-    def mark_goal(goal_text: str) -> None:
-        for index, goal in enumerate(goals):
-            if goal_text.lower() in goal.lower() or goal.lower() in goal_text.lower():
-                completed[index] = True
+def _reflection_text(text: str) -> str:
+    """Return the text after the first colon (or the whole text) as the reflection."""
+    head, separator, remainder = text.partition(":")
+    return (remainder if separator else head).strip()
 
-    for key, value in structured_outputs.items():
-        key_lower = str(key).lower()
+
+def _collect_evening_signals(structured_outputs: Dict[str, object]) -> Tuple[List[str], str]:
+    """Walk the evening structured output once, gathering completion texts and reflections.
+
+    Returns the texts that report a completed goal (in payload order) and the
+    first reflection found.
+    """
+    completion_texts: List[str] = []
+    reflections = ""
+
+    for value in structured_outputs.values():
         if isinstance(value, dict):
-            if "completed" in value and "goal" in value:
-                goal_text = str(value["goal"])
-                if value["completed"]:
-                    mark_goal(goal_text)
+            if "completed" in value and "goal" in value and value["completed"]:
+                completion_texts.append(str(value["goal"]))
             if "result" in value and isinstance(value["result"], str):
-                lines = value["result"].splitlines()
-                for line in lines:
-                    lower_line = line.lower()
-                    if "reflection" in lower_line and not reflections:
-                        reflections = line.split(":", 1)[-1].strip() if ":" in line else line.strip()
+                for line in value["result"].splitlines():
+                    if not reflections and _REFLECTION_RE.search(line):
+                        reflections = _reflection_text(line)
                         continue
-                    if "complete" in lower_line or "[x]" in lower_line:
-                        mark_goal(line)
+                    if _COMPLETE_RE.search(line):
+                        completion_texts.append(line)
         elif isinstance(value, list):
             for item in value:
                 if isinstance(item, dict):
                     if item.get("completed"):
-                        mark_goal(str(item.get("goal", "")))
+                        completion_texts.append(str(item.get("goal", "")))
                     if "reflections" in item and not reflections:
                         reflections = str(item["reflections"]).strip()
                 elif isinstance(item, str):
-                    lower_item = item.lower()
-                    if "reflection" in lower_item and not reflections:
-                        reflections = item.split(":", 1)[-1].strip() if ":" in item else item.strip()
-                    if "complete" in lower_item or "[x]" in lower_item:
-                        mark_goal(item)
+                    if not reflections and _REFLECTION_RE.search(item):
+                        reflections = _reflection_text(item)
+                    if _COMPLETE_RE.search(item):
+                        completion_texts.append(item)
         elif isinstance(value, str):
-            lower_value = value.lower()
-            if "reflection" in lower_value and not reflections:
-                reflections = value.split(":", 1)[-1].strip() if ":" in value else value.strip()
-            if "complete" in lower_value or "[x]" in lower_value:
-                for line in value.splitlines():
-                    if "complete" in line.lower() or "[x]" in line.lower():
-                        mark_goal(line)
+            if not reflections and _REFLECTION_RE.search(value):
+                reflections = _reflection_text(value)
+            if _COMPLETE_RE.search(value):
+                completion_texts.extend(
+                    line for line in value.splitlines() if _COMPLETE_RE.search(line)
+                )
+
+    return completion_texts, reflections
+
+
+def _parse_evening_results(
+    structured_outputs: Dict[str, object],
+    goals: List[str],
+) -> Tuple[List[bool], str]:
+    """Derive completion booleans and reflections text from Vapi structured output."""
+    completed = [False] * len(goals)
+
+    if not structured_outputs:
+        return completed, ""
+
+    completion_texts, reflections = _collect_evening_signals(structured_outputs)
+
+    # Lowercase everything once and match each distinct completion text a single
+    # time, even when the same text appears under several keys. Goals already
+    # marked complete drop out of the scan, which ends once none are left.
+    pending = [(index, goal.lower()) for index, goal in enumerate(goals)]
+    for text_lower in dict.fromkeys(text.lower() for text in completion_texts):
+        if not pending:
+            break
+        still_pending = []
+        for index, goal_lower in pending:
+            if text_lower in goal_lower or goal_lower in text_lower:
+                completed[index] = True
+            else:
+                still_pending.append((index, goal_lower))
+        pending = still_pending
 
     return completed, reflections
 
 
 def _sync_evening_to_obsidian(
+    vault: VaultClone,
     goals: List[str],
     completed: List[bool],
     call_time: datetime,
     reflections: str,
 ) -> None:
-    obsidian_enabled = os.environ.get("OBSIDIAN_ENABLED", "false").lower() == "true"
-    if not obsidian_enabled:
-        print("Obsidian sync disabled; skipping evening vault update.")
-        return
-
-    repo_url = os.environ.get("OBSIDIAN_REPO_URL")
-    github_token = os.environ.get("OBSIDIAN_GITHUB_TOKEN")
-
-    if not repo_url or not github_token:
-        print("Obsidian sync requested but repository URL or token missing; skipping.")
-        return
-
-    if not goals:
-        print("No goals available to update evening entry; skipping Obsidian sync.")
-        return
-
-    try:
-        with ObsidianGitSync(repo_url, github_token) as git_sync:
-            obsidian = ObsidianSync(str(git_sync.vault_path), git_sync=git_sync)
-            obsidian.update_evening_entry(goals, completed, call_time, reflections)
-        print("Obsidian vault updated with evening review.")
-    except Exception as exc:
-        print(f"Obsidian evening sync failed: {exc}")
+    sync_to_obsidian(
+        vault,
+        lambda obsidian: obsidian.update_evening_entry(goals, completed, call_time, reflections),
+        label="evening",
+        success_message="Obsidian vault updated with evening review.",
+    )
 
 
 # ---------------------------------------------------------------------
@@ -164,6 +188,7 @@ morning_call = find_structured_call(
     client,
     assistant_id=MORNING_ASSISTANT_ID,
     target_number=TARGET_PHONE_NUMBER,
+    phone_number_id=PHONE_NUMBER_ID,
     base_time=morning_anchor,
     time_tolerance=tolerance_delta,
 )
@@ -171,8 +196,7 @@ morning_call = find_structured_call(
 if not morning_call:
     print(f"No successful morning calls with structured outputs found for {TARGET_PHONE_NUMBER}")
 else:
-    artifact = getattr(morning_call, "artifact", None)
-    structured_outputs = getattr(artifact, "structured_outputs", {}) if artifact else {}
+    structured_outputs = structured_outputs_of(morning_call)
 
     print("Last successful morning call with structured outputs:")
     print(f"Call ID: {morning_call.id}")
@@ -225,46 +249,46 @@ else:
     print("Initiating evening call...")
     print("=" * 50)
 
-    if VAPI_SKIP_OUTBOUND_CALL:
-        print("VAPI_SKIP_OUTBOUND_CALL=true; skipping outbound evening call creation for testing.")
-    else:
-        new_call = client.calls.create(
-            assistant_id=EVENING_ASSISTANT_ID,
-            phone_number_id=PHONE_NUMBER_ID,
-            customer={"number": TARGET_PHONE_NUMBER},
-        )
-
-        print(f"\nEvening call initiated successfully!")
-        print(f"Call ID: {new_call.id}")
-        print(f"Status: {new_call.status}")
-        print(f"Calling: {TARGET_PHONE_NUMBER}")
-        print("Using updated evening assistant with morning goals")
-
-    # Attempt to sync the most recent completed evening call to Obsidian
-    evening_anchor = cron_reference_time(EVENING_CALL_TIME) or datetime.now(timezone.utc)
-    evening_call = wait_for_structured_output(
+    new_call = place_call(
         client,
         assistant_id=EVENING_ASSISTANT_ID,
+        phone_number_id=PHONE_NUMBER_ID,
         target_number=TARGET_PHONE_NUMBER,
-        base_time=evening_anchor,
-        poll_interval=poll_interval,
-        timeout=timeout_delta,
-        time_tolerance=tolerance_delta,
+        label="evening",
+        skip=VAPI_SKIP_OUTBOUND_CALL,
     )
-    if evening_call:
-        evening_artifact = getattr(evening_call, "artifact", None)
-        evening_outputs = (
-            getattr(evening_artifact, "structured_outputs", {}) if evening_artifact else {}
-        )
-        completed_flags, reflections_text = _parse_evening_results(evening_outputs, goals_list)
-        call_timestamp = (
-            parse_vapi_datetime(getattr(evening_call, "ended_at", None))
-            or parse_vapi_datetime(getattr(evening_call, "started_at", None))
-            or datetime.now(timezone.utc)
-        )
-        _sync_evening_to_obsidian(goals_list, completed_flags, call_timestamp, reflections_text)
-    else:
-        print(
-            "No evening structured output available within the configured timeout; "
-            "skipping Obsidian update for now."
-        )
+    if new_call:
+        print("Using updated evening assistant with morning goals")
+
+    # Attempt to sync the most recent completed evening call to Obsidian; the
+    # structured output has no other consumer, so skip the clone and the wait
+    # when sync is disabled or there are no morning goals to review.
+    repository = obsidian_repository("evening")
+    if repository and not goals_list:
+        print("No goals available to update evening entry; skipping Obsidian sync.")
+    elif repository:
+        evening_anchor = cron_reference_time(EVENING_CALL_TIME) or datetime.now(timezone.utc)
+        # Clone the vault while the call is still in progress.
+        with VaultClone(repository) as vault:
+            evening_call = wait_for_structured_output(
+                client,
+                assistant_id=EVENING_ASSISTANT_ID,
+                target_number=TARGET_PHONE_NUMBER,
+                phone_number_id=PHONE_NUMBER_ID,
+                base_time=evening_anchor,
+                poll_interval=poll_interval,
+                timeout=timeout_delta,
+                time_tolerance=tolerance_delta,
+            )
+            if evening_call:
+                evening_outputs = structured_outputs_of(evening_call)
+                completed_flags, reflections_text = _parse_evening_results(evening_outputs, goals_list)
+                evening_time = call_timestamp(evening_call)
+                _sync_evening_to_obsidian(
+                    vault, goals_list, completed_flags, evening_time, reflections_text
+                )
+            else:
+                print(
+                    "No evening structured output available within the configured timeout; "
+                    "skipping Obsidian update for now."
+                )
@@ -2,14 +2,57 @@
 
 from __future__ import annotations
 
+import io
+import itertools
 import json
 import os
+import re
+import shlex
 import shutil
 import subprocess
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# PyYAML is listed in requirements.txt, but cron's `git pull` can deliver this
+# code before the container reinstalls dependencies; without it the
+# frontmatter is parsed line by line.
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Commits of history fetched when cloning the vault; only HEAD is needed to
+# add a file and push. Overridable via OBSIDIAN_CLONE_DEPTH (0 = full history).
+DEFAULT_CLONE_DEPTH = 1
+
+# Exit status the commit script uses to report that nothing was staged.
+_NOTHING_TO_COMMIT = 3
+
+# Exit status the refresh script uses when the cached checkout cannot be reused.
+_STALE_CHECKOUT = 4
+
+# File written into the .git directory of persistent checkouts this module
+# cloned; only checkouts carrying it are ever reset or deleted.
+_CACHE_MARKER = "accountability-buddy-cache"
+
+# Parsed goals keyed by the JSON encoding of their payload, oldest evicted first.
+_GOALS_CACHE: Dict[str, Tuple[str, ...]] = {}
+_GOALS_CACHE_SIZE = 128
+
+# Characters YAML reads as line breaks or rejects in a document; the frontmatter
+# writer keeps these as \u escapes rather than raw UTF-8.
+_YAML_UNSAFE_RE = re.compile("[\x7f-\x9f\u2028\u2029\ud800-\udfff\ufeff\ufffe\uffff]")
+
+# An "## Accountability" header line in a daily note (any case, padded by spaces).
+_ACCOUNTABILITY_HEADER_RE = re.compile(r"^[^\S\n]*## accountability[^\S\n]*$", re.IGNORECASE | re.MULTILINE)
+
+# Checkbox prefixes stripped from goal lines, compared as a 3-character slice.
+_CHECKBOX_PREFIXES = frozenset(("[ ]", "[x]", "[X]"))
+
+# Buffer size for vault file I/O; big enough that a note moves in one syscall.
+_IO_BUFFER_SIZE = 64 * 1024
 
 
 def parse_goals_from_vapi_output(structured_output: Optional[dict]) -> List[str]:
@@ -23,30 +66,37 @@ def parse_goals_from_vapi_output(structured_output: Optional[dict]) -> List[str]
 
     The function attempts to normalise both forms into a flat ``List[str]``.
     If the payload is missing or cannot be parsed, an empty list is returned.
+    Results are cached per payload, so re-parsing the same output is a lookup.
     """
     if not structured_output:
         return []
 
-    goals: List[str] = []
+    try:
+        # Not sort_keys: goal order follows the payload's key order.
+        key = json.dumps(structured_output)
+    except (TypeError, ValueError):
+        # Not plain JSON data; parse without caching.
+        return list(_parse_goals(structured_output))
+
+    goals = _GOALS_CACHE.get(key)
+    if goals is None:
+        goals = _parse_goals(structured_output)
+        if len(_GOALS_CACHE) >= _GOALS_CACHE_SIZE:
+            del _GOALS_CACHE[next(iter(_GOALS_CACHE))]
+        _GOALS_CACHE[key] = goals
+    return list(goals)
 
-    def _clean_goal(line: str) -> str:
-        stripped = line.strip()
-        if not stripped:
-            return ""
-        # Remove common numbering prefixes like "1." or "1)".
-        if stripped[0].isdigit():
-            parts = stripped.split(maxsplit=1)
-            if len(parts) == 2 and parts[0].rstrip(").").isdigit():
-                return parts[1].strip()
-        # Remove checkbox prefix if present.
-        if stripped.lower().startswith("[ ]") or stripped.lower().startswith("[x]"):
-            return stripped[3:].strip()
-        return stripped
+
+def _parse_goals(structured_output: Optional[dict]) -> Tuple[str, ...]:
+    if not structured_output:
+        return ()
+
+    goals: List[str] = []
 
     for value in structured_output.values():
         if isinstance(value, dict):
             # Nested dictionary – recurse one level.
-            nested_goals = parse_goals_from_vapi_output(value)
+            nested_goals = _parse_goals(value)
             goals.extend(nested_goals)
             continue
 
@@ -66,11 +116,80 @@ def parse_goals_from_vapi_output(structured_output: Optional[dict]) -> List[str]
         if goal not in seen:
             unique_goals.append(goal)
             seen.add(goal)
-    return unique_goals
+    return tuple(unique_goals)
+
+
+def _clean_goal(line: str) -> str:
+    """Strip whitespace and a single numbering or checkbox prefix from a goal line."""
+    stripped = line.strip()
+    if not stripped:
+        return ""
+    first = stripped[0]
+    # Remove common numbering prefixes like "1." or "1)".
+    if first.isdigit():
+        parts = stripped.split(maxsplit=1)
+        if len(parts) == 2 and parts[0].rstrip(").").isdigit():
+            return parts[1].strip()
+    elif first == "[" and stripped[:3] in _CHECKBOX_PREFIXES:
+        return stripped[3:].strip()
+    return stripped
+
+
+if yaml is not None:
+
+    class _FrontmatterLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+        """Safe YAML loader (libyaml when available) that leaves dates as strings.
+
+        The frontmatter is written back with ``json.dumps``, which cannot
+        encode the ``date``/``datetime`` objects YAML would otherwise produce.
+        """
+
+    _FrontmatterLoader.yaml_implicit_resolvers = {
+        first: [(tag, regexp) for tag, regexp in resolvers if tag != "tag:yaml.org,2002:timestamp"]
+        for first, resolvers in _FrontmatterLoader.yaml_implicit_resolvers.items()
+    }
+
+
+def _frontmatter_value(value: object) -> str:
+    """Encode a frontmatter value as JSON, which is also a valid YAML flow scalar."""
+    encoded = json.dumps(value, ensure_ascii=False)
+    return _YAML_UNSAFE_RE.sub(lambda match: f"\\u{ord(match.group()):04x}", encoded)
+
+
+def _clone_depth_from_env() -> int:
+    raw = os.environ.get("OBSIDIAN_CLONE_DEPTH")
+    if not raw:
+        return DEFAULT_CLONE_DEPTH
+    try:
+        return int(raw)
+    except ValueError:
+        print(f"[ObsidianGitSync] Invalid OBSIDIAN_CLONE_DEPTH {raw!r}; using {DEFAULT_CLONE_DEPTH}.")
+        return DEFAULT_CLONE_DEPTH
+
+
+def _write_text_atomic(path: Path, content: str) -> None:
+    """Write ``content`` to ``path`` via a sibling temp file and ``os.replace``.
+
+    A crash mid-write leaves the previous note intact instead of a truncated one.
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as handle:
+            handle.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 class ObsidianGitSync:
-    """Clone, update, and push an Obsidian vault hosted on GitHub."""
+    """Clone, update, and push an Obsidian vault hosted on GitHub.
+
+    By default every run clones into a fresh temporary directory. Passing
+    ``persistent_path`` (or setting ``OBSIDIAN_VAULT_CACHE``) keeps the
+    checkout there between runs instead, so later runs only fetch the new
+    commits and reset onto them.
+    """
 
     def __init__(
         self,
@@ -78,6 +197,8 @@ class ObsidianGitSync:
         github_token: str,
         git_user_name: Optional[str] = None,
         git_user_email: Optional[str] = None,
+        persistent_path: Optional[str | Path] = None,
+        clone_depth: Optional[int] = None,
     ) -> None:
         self.repo_url = repo_url
         self.github_token = github_token
@@ -87,9 +208,19 @@ class ObsidianGitSync:
         self.git_user_email = git_user_email or os.environ.get(
             "OBSIDIAN_GIT_USER_EMAIL", "bot@accountability.local"
         )
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="obsidian_vault_"))
+        self.clone_depth = clone_depth if clone_depth is not None else _clone_depth_from_env()
+        persistent_path = persistent_path or os.environ.get("OBSIDIAN_VAULT_CACHE")
+        self.persistent_path = Path(persistent_path).expanduser() if persistent_path else None
+        self._temp_dir: Optional[Path] = None
         self.repo_dir: Optional[Path] = None
 
+    @property
+    def temp_dir(self) -> Path:
+        """Scratch directory for a non-persistent clone, created on first use."""
+        if self._temp_dir is None:
+            self._temp_dir = Path(tempfile.mkdtemp(prefix="obsidian_vault_"))
+        return self._temp_dir
+
     @property
     def vault_path(self) -> Path:
         if not self.repo_dir:
@@ -106,72 +237,155 @@ class ObsidianGitSync:
     # Git operations -----------------------------------------------------
 
     def clone_repo(self) -> None:
-        """Clone the Obsidian vault using a fresh temporary directory."""
+        """Clone the Obsidian vault, or refresh the persistent checkout if present."""
         if self.repo_dir and self.repo_dir.exists():
             return
 
-        repo_name = self._repo_name(self.repo_url)
-        target_dir = self.temp_dir / repo_name
+        if self.persistent_path:
+            target_dir = self.persistent_path
+            if (target_dir / ".git").exists() and self._refresh_checkout(target_dir):
+                return
+            target_dir.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            target_dir = self.temp_dir / self._repo_name(self.repo_url)
 
         auth_url = self._build_authenticated_url(self.repo_url, self.github_token)
         print(f"[ObsidianGitSync] Cloning vault into {target_dir}")
-        self._run_git(["clone", auth_url, str(target_dir)])
+        clone = ["clone", *self._clone_flags()]
+        self._run_shell(
+            self._git_script([*clone, auth_url, str(target_dir)]),
+            display=self._git_script([*clone, self._redacted_url(), str(target_dir)]),
+        )
+        if self.persistent_path:
+            (target_dir / ".git" / _CACHE_MARKER).write_text(
+                "Cloned by Accountability Buddy; reset and re-cloned as needed.\n",
+                encoding="utf-8",
+            )
 
         self.repo_dir = target_dir
-        self._configure_git_identity()
 
     def commit_and_push(self, message: str) -> bool:
         """Commit staged changes and push to the remote repository.
 
+        The vault may have moved on since the clone (e.g. an Obsidian Git
+        auto-push while the call was in progress), so a rejected push is
+        retried once after rebasing the new commit onto the fetched remote.
+
         Returns ``True`` if a commit was created and pushed, otherwise ``False``.
         """
         if not self.repo_dir:
             raise RuntimeError("Cannot commit before repository clone.")
 
-        status = self._run_git(["status", "--porcelain"], capture_output=True).strip()
-        if not status:
+        # Stage everything, then commit and push only if something was staged,
+        # all from one shell. Rebasing only HEAD^..HEAD keeps the retry working
+        # in a shallow clone, where the old and new remote tips share no history.
+        identity = ["-c", f"user.name={self.git_user_name}", "-c", f"user.email={self.git_user_email}"]
+        push = self._git_script(["push", "origin", "HEAD"])
+        retry = self._git_script(
+            ["fetch", *self._depth_flags(), "origin"],
+            [*identity, "rebase", "--onto", "origin/HEAD", "HEAD^"],
+            ["push", "origin", "HEAD"],
+        )
+        script = (
+            f"{self._git_script(['add', '.'])} && "
+            f"{{ {self._git_script(['diff', '--cached', '--quiet'])} && exit {_NOTHING_TO_COMMIT}; "
+            f"{self._git_script([*identity, 'commit', '-m', message])} && "
+            f"{{ {push} || {{ echo '[ObsidianGitSync] Push rejected; rebasing onto origin and retrying.' && {retry}; }} "
+            f"|| {{ git rebase --abort 2> /dev/null; exit 1; }}; }}; }}"
+        )
+        returncode = self._run_shell(script, check=False)
+        if returncode == _NOTHING_TO_COMMIT:
             print("[ObsidianGitSync] No changes detected; skipping commit.")
             return False
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, script)
 
-        print(f"[ObsidianGitSync] Committing changes: {message}")
-        self._run_git(["add", "."], check=True)
-        self._run_git(["commit", "-m", message], check=True)
-        self._run_git(["push", "origin", "HEAD"], check=True)
+        print(f"[ObsidianGitSync] Committed and pushed changes: {message}")
         return True
 
     def cleanup(self) -> None:
-        """Remove the temporary directory used for cloning."""
-        if self.temp_dir.exists():
-            print(f"[ObsidianGitSync] Cleaning up {self.temp_dir}")
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
+        """Remove the temporary directory used for cloning.
 
-    def _configure_git_identity(self) -> None:
-        """Set the git author identity for commits created in the vault."""
-        if not self.repo_dir:
-            return
-        self._run_git(["config", "user.name", self.git_user_name])
-        self._run_git(["config", "user.email", self.git_user_email])
-
-    def _run_git(
-        self,
-        args: Iterable[str],
-        check: bool = True,
-        capture_output: bool = False,
-    ) -> str:
-        """Execute a git command inside the cloned repository."""
-        cmd = ["git"]
-        cmd.extend(args)
-        print(f"[ObsidianGitSync] Running: {' '.join(cmd)}")
-        result = subprocess.run(
-            cmd,
-            cwd=str(self.repo_dir or self.temp_dir),
-            check=check,
-            capture_output=capture_output,
-            text=True,
+        A persistent checkout is left in place for the next run.
+        """
+        if self._temp_dir is not None and self._temp_dir.exists():
+            print(f"[ObsidianGitSync] Cleaning up {self._temp_dir}")
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _refresh_checkout(self, checkout: Path) -> bool:
+        """Update an existing persistent checkout to the remote's latest commit.
+
+        Only checkouts this module cloned (marked with ``_CACHE_MARKER``) are
+        touched; any other repository raises instead of being reset. Returns
+        ``False`` (after removing the checkout) when the checkout has no valid
+        ``HEAD`` or its ``origin`` is not the configured repository and token,
+        so the caller can clone afresh. Other failures, such as a fetch that
+        cannot reach the remote, are raised and leave the checkout in place.
+        """
+        if not (checkout / ".git" / _CACHE_MARKER).is_file():
+            raise RuntimeError(
+                f"{checkout} is a git checkout that Accountability Buddy did not clone; "
+                "refusing to reset or replace it. Point OBSIDIAN_VAULT_CACHE at a dedicated directory."
+            )
+        print(f"[ObsidianGitSync] Refreshing vault in {checkout}")
+        self.repo_dir = checkout
+        auth_url = self._build_authenticated_url(self.repo_url, self.github_token)
+        script = (
+            f"{{ git rev-parse --quiet --verify HEAD > /dev/null && "
+            f"test \"$(git remote get-url origin)\" = {shlex.quote(auth_url)}; }} "
+            f"|| exit {_STALE_CHECKOUT}; "
+            + self._git_script(
+                ["fetch", *self._depth_flags(), "origin"],
+                ["reset", "--hard", "origin/HEAD"],
+                ["clean", "-fd"],
+            )
         )
-        if capture_output:
-            return result.stdout
-        return ""
+        display = script.replace(auth_url, self._redacted_url())
+        returncode = self._run_shell(script, check=False, display=display)
+        if returncode == _STALE_CHECKOUT:
+            print("[ObsidianGitSync] Cached checkout is unusable or tracks another remote; cloning again.")
+            self.repo_dir = None
+            shutil.rmtree(checkout, ignore_errors=True)
+            return False
+        if returncode:
+            self.repo_dir = None
+            raise subprocess.CalledProcessError(returncode, display)
+        return True
+
+    def _depth_flags(self) -> List[str]:
+        return [f"--depth={self.clone_depth}"] if self.clone_depth > 0 else []
+
+    def _clone_flags(self) -> List[str]:
+        """Clone only the default branch, without tags, fetching blobs on demand."""
+        return [*self._depth_flags(), "--single-branch", "--filter=blob:none", "--no-tags"]
+
+    def _working_dir(self) -> Optional[str]:
+        # Before the clone exists, git runs from the process's own directory;
+        # clone targets are absolute or relative to it, as the caller gave them.
+        return str(self.repo_dir) if self.repo_dir else None
+
+    @staticmethod
+    def _git_script(*commands: Sequence[str]) -> str:
+        """Chain git commands with ``&&`` into one safely quoted shell script."""
+        return " && ".join(shlex.join(["git", *command]) for command in commands)
+
+    def _run_shell(self, script: str, check: bool = True, display: Optional[str] = None) -> int:
+        """Run a shell script inside the cloned repository and return its exit status.
+
+        Batching several git commands into one ``bash -c`` saves a process
+        start-up per command. ``display`` replaces the script in the log line
+        and in any raised error, e.g. to keep credentials out of them.
+        """
+        shown = display or script
+        print(f"[ObsidianGitSync] Running: {shown}")
+        result = subprocess.run(["bash", "-c", script], cwd=self._working_dir())
+        if check and result.returncode:
+            raise subprocess.CalledProcessError(result.returncode, shown)
+        return result.returncode
+
+    def _redacted_url(self) -> str:
+        """The authenticated repository URL with the token masked, for logs."""
+        return self._build_authenticated_url(self.repo_url.replace(self.github_token, "***"), "***")
 
     @staticmethod
     def _build_authenticated_url(repo_url: str, token: str) -> str:
@@ -200,6 +414,8 @@ class ObsidianSync:
     def __init__(self, vault_path: str | Path, git_sync: Optional[ObsidianGitSync] = None) -> None:
         self.vault_path = Path(vault_path)
         self.git_sync = git_sync
+        # Dates whose daily note is known to embed the log in this session.
+        self._daily_notes_done: Set[str] = set()
 
     def create_morning_entry(
         self,
@@ -224,7 +440,7 @@ class ObsidianSync:
         }
 
         content = self._render_morning_content(metadata, goals)
-        file_path.write_text(content, encoding="utf-8")
+        _write_text_atomic(file_path, content)
         print(f"[ObsidianSync] Morning entry created at {file_path}")
 
         self._update_daily_note(date_str, call_time)
@@ -253,17 +469,23 @@ class ObsidianSync:
             print(f"[ObsidianSync] Morning entry {file_path} not found; cannot update evening review.")
             return None
 
-        metadata, _ = self._read_accountability_file(file_path)
+        metadata, _ = self._read_accountability_file(file_path, include_body=False)
+        completed_goals: List[str] = []
+        incomplete_goals: List[str] = []
+        for goal, done in zip(goals, completed):
+            (completed_goals if done else incomplete_goals).append(goal)
+
         metadata["evening_time"] = call_time.isoformat()
-        metadata["completed_goals"] = [goal for goal, done in zip(goals, completed) if done]
+        metadata["completed_goals"] = completed_goals
 
         total = len(goals)
-        completed_count = sum(1 for done in completed if done)
-        completion_rate = int((completed_count / total) * 100) if total else 0
+        completion_rate = int((len(completed_goals) / total) * 100) if total else 0
         metadata["completion_rate"] = completion_rate
 
-        content = self._render_evening_content(metadata, goals, completed, reflections)
-        file_path.write_text(content, encoding="utf-8")
+        content = self._render_evening_content(
+            metadata, goals, completed, completed_goals, incomplete_goals, reflections
+        )
+        _write_text_atomic(file_path, content)
         print(f"[ObsidianSync] Evening entry updated at {file_path}")
 
         if self.git_sync:
@@ -276,91 +498,103 @@ class ObsidianSync:
 
     def _render_morning_content(self, metadata: Dict[str, object], goals: List[str]) -> str:
         """Render the morning accountability Markdown content."""
-        frontmatter = self._format_frontmatter(metadata)
-        goals_section = self._format_goals(goals, completed=[])
-
-        body = [
-            frontmatter,
-            "# Morning Accountability",
-            "",
-            "## Goals",
-            goals_section,
-            "",
-            "## Evening Review 🌙",
-            "Evening Review 🌙 - *Pending...*",
-            "",
-        ]
-        return "\n".join(body).strip() + "\n"
+        buffer = io.StringIO()
+        write = buffer.write
+        write(self._format_frontmatter(metadata))
+        write("\n# Morning Accountability\n\n## Goals\n")
+        write(self._format_goals(goals, completed=[]))
+        write("\n\n## Evening Review 🌙\nEvening Review 🌙 - *Pending...*\n")
+        return buffer.getvalue().strip() + "\n"
 
     def _render_evening_content(
         self,
         metadata: Dict[str, object],
         goals: List[str],
         completed: List[bool],
+        completed_goals: List[str],
+        incomplete_goals: List[str],
         reflections: str,
     ) -> str:
         """Render the evening accountability Markdown update."""
-        frontmatter = self._format_frontmatter(metadata)
-        goals_section = self._format_goals(goals, completed)
-
-        completed_goals = [goal for goal, done in zip(goals, completed) if done]
-        incomplete_goals = [goal for goal, done in zip(goals, completed) if not done]
-
-        body = [
-            frontmatter,
-            "# Morning Accountability",
-            "",
-            "## Goals",
-            goals_section,
-            "",
-            "## Evening Review 🌙",
-            f"- Completion Rate: {metadata.get('completion_rate', 0)}%",
-        ]
+        buffer = io.StringIO()
+        write = buffer.write
+        write(self._format_frontmatter(metadata))
+        write("\n# Morning Accountability\n\n## Goals\n")
+        write(self._format_goals(goals, completed))
+        write(f"\n\n## Evening Review 🌙\n- Completion Rate: {metadata.get('completion_rate', 0)}%")
 
         if completed_goals:
-            body.append("- Completed:")
-            body.extend([f"  - ✅ {goal}" for goal in completed_goals])
+            write("\n- Completed:")
+            write("".join(f"\n  - ✅ {goal}" for goal in completed_goals))
         if incomplete_goals:
-            body.append("- Not Completed:")
-            body.extend([f"  - ⚪️ {goal}" for goal in incomplete_goals])
+            write("\n- Not Completed:")
+            write("".join(f"\n  - ⚪️ {goal}" for goal in incomplete_goals))
 
         if reflections:
-            body.append("")
-            body.append("### Reflections")
-            body.append(reflections.strip())
+            write("\n\n### Reflections\n")
+            write(reflections.strip())
 
-        body.append("")
-        return "\n".join(body).strip() + "\n"
+        return buffer.getvalue().strip() + "\n"
 
     def _format_frontmatter(self, metadata: Dict[str, object]) -> str:
         """Convert the metadata dictionary into YAML frontmatter."""
         lines = ["---"]
         for key, value in metadata.items():
-            lines.append(f"{key}: {json.dumps(value)}")
+            lines.append(f"{key}: {_frontmatter_value(value)}")
         lines.append("---")
         return "\n".join(lines)
 
     def _format_goals(self, goals: List[str], completed: Iterable[bool]) -> str:
         """Render the numbered goal list with checkbox state."""
-        completed_list = list(completed)
-        lines = []
-        for index, goal in enumerate(goals, start=1):
-            is_completed = completed_list[index - 1] if index - 1 < len(completed_list) else False
-            checkbox = "[x]" if is_completed else "[ ]"
-            lines.append(f"{index}. {checkbox} {goal}")
-        return "\n".join(lines) if lines else "No goals recorded."
-
-    def _read_accountability_file(self, path: Path) -> Tuple[Dict[str, object], str]:
-        """Read an existing accountability file and return metadata and body."""
-        content = path.read_text(encoding="utf-8")
-        if not content.startswith("---"):
-            return {}, content
-
-        parts = content.split("---", 2)
-        if len(parts) < 3:
-            return {}, content
-
-        frontmatter_text = parts[1].strip()
+        # Goals beyond the end of ``completed`` render unchecked.
+        states = itertools.chain(completed, itertools.repeat(False))
+        rendered = "\n".join(
+            f"{index}. {'[x]' if done else '[ ]'} {goal}"
+            for index, (goal, done) in enumerate(zip(goals, states), start=1)
+        )
+        return rendered or "No goals recorded."
+
+    def _read_accountability_file(
+        self, path: Path, include_body: bool = True
+    ) -> Tuple[Dict[str, object], str]:
+        """Read an existing accountability file and return metadata and body.
+
+        Lines are read only up to the closing ``---`` of the frontmatter; the
+        rest of the file is read only when ``include_body`` is set (the body is
+        returned empty otherwise).
+        """
+        with path.open("r", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as handle:
+            first_line = handle.readline()
+            if not first_line.startswith("---"):
+                return {}, first_line + handle.read() if include_body else ""
+
+            lines = [first_line]
+            end = first_line.find("---", 3)
+            while end == -1:
+                line = handle.readline()
+                if not line:
+                    return {}, "".join(lines) if include_body else ""
+                lines.append(line)
+                end = line.find("---")
+            last_line = lines[-1]
+            body = last_line[end + 3 :] + handle.read() if include_body else ""
+
+        frontmatter_text = ("".join(lines[:-1]) + last_line[:end])[3:].strip()
+        return self._parse_frontmatter(frontmatter_text), body
+
+    @staticmethod
+    def _parse_frontmatter(frontmatter_text: str) -> Dict[str, object]:
+        """Parse frontmatter as YAML, falling back to one JSON value per line."""
+        if yaml is not None:
+            try:
+                parsed = yaml.load(frontmatter_text, Loader=_FrontmatterLoader)
+            except yaml.YAMLError:
+                parsed = None
+            if isinstance(parsed, dict):
+                return {str(key): value for key, value in parsed.items()}
+
+        # Not a YAML mapping (or PyYAML missing), e.g. files whose values were
+        # written with surrogate-pair escapes, which libyaml rejects.
         metadata: Dict[str, object] = {}
         for line in frontmatter_text.splitlines():
             if ":" not in line:
@@ -373,47 +607,49 @@ class ObsidianSync:
             except json.JSONDecodeError:
                 metadata[key] = raw_value
 
-        return metadata, parts[2]
+        return metadata
 
     def _update_daily_note(self, date_str: str, call_time: datetime) -> Path:
         """Ensure the daily note embeds the accountability log for the given date."""
         note_path = self.vault_path / self.daily_notes_path / f"{date_str}.md"
-        note_path.parent.mkdir(parents=True, exist_ok=True)
+        if date_str in self._daily_notes_done:
+            return note_path
         embed = f"![[{date_str}-accountability]]"
 
-        if note_path.exists():
+        try:
             content = note_path.read_text(encoding="utf-8")
-            if embed in content:
-                return note_path
-            lines = content.splitlines()
-
+        except FileNotFoundError:
+            content = None
+
+        if content is None:
+            # Create a new daily note.
+            note_path.parent.mkdir(parents=True, exist_ok=True)
+            title = call_time.strftime("%A, %B %d, %Y")
+            lines = [
+                f"# {title}",
+                "",
+                "## Accountability",
+                embed,
+                "",
+            ]
+            _write_text_atomic(note_path, "\n".join(lines))
+            print(f"[ObsidianSync] Daily note created at {note_path}")
+        elif embed not in content:
             # Try to insert under an existing "## Accountability" header.
-            for index, line in enumerate(lines):
-                if line.strip().lower() == "## accountability":
-                    insertion_index = index + 1
-                    lines.insert(insertion_index, "")
-                    lines.insert(insertion_index + 1, embed)
-                    note_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-                    print(f"[ObsidianSync] Daily note updated at {note_path}")
-                    return note_path
-
-            # Fallback: append a new section at the end.
-            lines.extend(["", "## Accountability", embed])
-            note_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            header = _ACCOUNTABILITY_HEADER_RE.search(content)
+            if header:
+                updated = f"{content[: header.end()]}\n\n{embed}{content[header.end() :]}"
+                if not updated.endswith("\n"):
+                    updated += "\n"
+            else:
+                # Fallback: append a new section at the end.
+                lines = content.splitlines()
+                lines.extend(["", "## Accountability", embed])
+                updated = "\n".join(lines) + "\n"
+            _write_text_atomic(note_path, updated)
             print(f"[ObsidianSync] Daily note updated at {note_path}")
-            return note_path
 
-        # Create a new daily note.
-        title = call_time.strftime("%A, %B %d, %Y")
-        content = [
-            f"# {title}",
-            "",
-            "## Accountability",
-            embed,
-            "",
-        ]
-        note_path.write_text("\n".join(content), encoding="utf-8")
-        print(f"[ObsidianSync] Daily note created at {note_path}")
+        self._daily_notes_done.add(date_str)
         return note_path
 
 
@@ -46,6 +46,14 @@ MORNING_ASSISTANT_ID=$MORNING_ASSISTANT_ID
 EVENING_ASSISTANT_ID=$EVENING_ASSISTANT_ID
 PHONE_NUMBER_ID=$PHONE_NUMBER_ID
 TARGET_PHONE_NUMBER=$TARGET_PHONE_NUMBER
+# Obsidian integration (quoted so unset values reach the jobs as empty strings)
+OBSIDIAN_ENABLED=${OBSIDIAN_ENABLED:-false}
+OBSIDIAN_REPO_URL="$OBSIDIAN_REPO_URL"
+OBSIDIAN_GITHUB_TOKEN="$OBSIDIAN_GITHUB_TOKEN"
+OBSIDIAN_GIT_USER_NAME=${OBSIDIAN_GIT_USER_NAME:-Accountability Buddy Bot}
+OBSIDIAN_GIT_USER_EMAIL=${OBSIDIAN_GIT_USER_EMAIL:-bot@accountability.local}
+OBSIDIAN_CLONE_DEPTH=${OBSIDIAN_CLONE_DEPTH:-1}
+OBSIDIAN_VAULT_CACHE="$OBSIDIAN_VAULT_CACHE"
 
 # Morning call
 $MORNING_CALL_TIME root cd "\$APP_DIR" && { git pull --ff-only && python3 make_morning_call.py; } >> /var/log/morning_call.log 2>&1
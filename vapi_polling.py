@@ -2,10 +2,54 @@
 
 from __future__ import annotations
 
+import functools
+import operator
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# ciso8601 (C parser) is listed in requirements.txt; fall back to
+# `datetime.fromisoformat` when an older install does not have it yet.
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+# Page size for list calls; filters are applied server-side so the first page
+# (most recent calls first) almost always contains the match.
+CALL_LIST_LIMIT = 20
+
+# Safety bound on pages walked when no creation-time window is known.
+CALL_LIST_MAX_PAGES = 5
+
+# Longest call expected to end inside the tolerance window after being created
+# before it; the server-side `created_at_gt` bound is widened by this much.
+MAX_CALL_DURATION = timedelta(hours=1)
+
+# Seconds after a call ends during which its structured output is still expected;
+# polling stays at the base rate while such a call is listed without one.
+ARTIFACT_PENDING_SECONDS = 300.0
+
+# Maximum number of concurrent `calls.get` requests issued by `fetch_calls`.
+CALL_FETCH_WORKERS = 8
+
+# Cleared once `calls.list` rejects the keyword filters (older SDK releases), so
+# later polls go straight to the unfiltered listing instead of failing again.
+_filtered_listing_supported = True
+
+# Filter fields read from every listed call in a single attrgetter call.
+_CALL_FILTER_FIELDS = operator.attrgetter("id", "status", "assistant_id", "customer")
+
+
+class _CallSummary(NamedTuple):
+    """Plain-tuple view of the listed-call fields the filters compare."""
+
+    id: Optional[str]
+    status: Optional[str]
+    assistant_id: Optional[str]
+    customer_number: Optional[str]
 
 
 def parse_vapi_datetime(timestamp: Optional[object]) -> Optional[datetime]:
@@ -17,9 +61,17 @@ def parse_vapi_datetime(timestamp: Optional[object]) -> Optional[datetime]:
         if parsed.tzinfo is None:
             parsed = parsed.replace(tzinfo=timezone.utc)
         return parsed
-    value = str(timestamp).replace("Z", "+00:00")
+    return _parse_timestamp_string(str(timestamp))
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_timestamp_string(timestamp: str) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp string; cached because polling re-reads the same values."""
     try:
-        parsed = datetime.fromisoformat(value)
+        if ciso8601 is not None:
+            parsed = ciso8601.parse_datetime(timestamp)
+        else:
+            parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
     except ValueError:
         return None
     if parsed.tzinfo is None:
@@ -27,62 +79,189 @@ def parse_vapi_datetime(timestamp: Optional[object]) -> Optional[datetime]:
     return parsed
 
 
-def _call_matches(
-    call: object,
+def _epoch_seconds(timestamp: Optional[object]) -> Optional[float]:
+    """Return a Vapi timestamp as seconds since the epoch (``None`` if missing or invalid)."""
+    parsed = parse_vapi_datetime(timestamp)
+    return parsed.timestamp() if parsed else None
+
+
+def structured_outputs_of(call: Optional[object]) -> dict:
+    """Return the structured outputs stored on a call's artifact (empty if absent)."""
+    artifact = getattr(call, "artifact", None)
+    return getattr(artifact, "structured_outputs", None) or {}
+
+
+def iter_candidate_calls(
+    client: object,
     *,
     assistant_id: str,
-    target_number: str,
+    phone_number_id: Optional[str] = None,
     base_time: Optional[datetime] = None,
     time_tolerance: Optional[timedelta] = None,
-) -> bool:
-    """Return True if the call matches the assistant/number/time constraints."""
-    customer = getattr(call, "customer", None)
-    if not customer:
-        return False
+) -> Iterator[object]:
+    """Yield recent calls for the assistant page by page, newest first.
+
+    Vapi does the coarse filtering; further pages are only requested (using the
+    oldest `created_at` seen as the cursor) if the caller keeps iterating. SDKs
+    without the filter parameters get a single unfiltered listing instead; this
+    is detected on the first request and remembered for the rest of the process.
+    """
+    global _filtered_listing_supported
+    if not _filtered_listing_supported:
+        yield from client.calls.list()
+        return
+
+    filters = {"assistant_id": assistant_id, "limit": CALL_LIST_LIMIT}
+    if phone_number_id:
+        filters["phone_number_id"] = phone_number_id
+    # `_call_matches` checks when a call ended (or started), but Vapi can only
+    # filter on creation time. A call created before the tolerance window may
+    # still end inside it, so the bound is widened by MAX_CALL_DURATION; only
+    # calls running longer than that can be dropped by this approximation.
+    if base_time is not None and time_tolerance is not None:
+        filters["created_at_gt"] = base_time - time_tolerance - MAX_CALL_DURATION
+
+    for page_number in range(CALL_LIST_MAX_PAGES):
+        try:
+            page = client.calls.list(**filters)
+        except TypeError as exc:
+            if page_number:
+                raise
+            # Older SDK releases reject these keyword filters; fall back to the
+            # default listing and leave all filtering to `_call_matches`.
+            print(f"[VapiPolling] Filtered call listing unsupported ({exc}); listing without filters.")
+            _filtered_listing_supported = False
+            yield from client.calls.list()
+            return
+        yield from page
+        if len(page) < CALL_LIST_LIMIT:
+            return
+        oldest_created_at = getattr(page[-1], "created_at", None)
+        if oldest_created_at is None:
+            return
+        filters["created_at_lt"] = oldest_created_at
+
+
+def fetch_calls(client: object, call_ids: Iterable[str]) -> List[object]:
+    """Fetch full call details for several calls concurrently, preserving order.
+
+    Vapi has no bulk call lookup, so the GETs are overlapped on a thread pool
+    (the SDK's httpx client is thread-safe) instead of being issued one by one.
+    """
+    ids = list(call_ids)
+    if not ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(CALL_FETCH_WORKERS, len(ids))) as executor:
+        return list(executor.map(lambda call_id: client.calls.get(id=call_id), ids))
+
+
+def _summarize_call(call: object) -> Optional[_CallSummary]:
+    """Read the filter fields off a listed call once (``None`` if any are missing)."""
+    try:
+        call_id, status, assistant_id, customer = _CALL_FILTER_FIELDS(call)
+    except AttributeError:
+        return None
 
     if isinstance(customer, dict):
         number = customer.get("number")
     else:
         number = getattr(customer, "number", None)
 
-    if number != target_number:
-        return False
+    return _CallSummary(call_id, status, assistant_id, number)
 
-    if getattr(call, "assistant_id", None) != assistant_id:
+
+def _awaiting_artifact(
+    call: object,
+    summary: Optional[_CallSummary],
+    *,
+    assistant_id: str,
+    target_number: str,
+    now_epoch: float,
+) -> bool:
+    """Return True for a call that ended recently and has no structured outputs yet."""
+    if (
+        summary is None
+        or summary.status != "ended"
+        or summary.assistant_id != assistant_id
+        or summary.customer_number != target_number
+        or structured_outputs_of(call)
+    ):
         return False
+    ended_epoch = _epoch_seconds(getattr(call, "ended_at", None))
+    return ended_epoch is not None and now_epoch - ended_epoch <= ARTIFACT_PENDING_SECONDS
+
+
+class _MatchWindow(NamedTuple):
+    """Time constraints for `_call_matches` as epoch seconds, resolved once per search."""
+
+    base_epoch: float
+    # Bounds of ``base_time``'s calendar day, in its own timezone.
+    day_start_epoch: float
+    day_end_epoch: float
+    tolerance_seconds: Optional[float]
+
+
+def _match_window(
+    base_time: Optional[datetime],
+    time_tolerance: Optional[timedelta],
+) -> Optional[_MatchWindow]:
+    """Resolve the time constraints once (``None`` without a base time)."""
+    if base_time is None:
+        return None
+    comparison_time = base_time if base_time.tzinfo else base_time.replace(tzinfo=timezone.utc)
+    day_start = comparison_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    tolerance_seconds = time_tolerance.total_seconds() if time_tolerance is not None else None
+    return _MatchWindow(
+        base_epoch=comparison_time.timestamp(),
+        day_start_epoch=day_start.timestamp(),
+        day_end_epoch=(day_start + timedelta(days=1)).timestamp(),
+        tolerance_seconds=tolerance_seconds,
+    )
 
-    if getattr(call, "status", None) != "ended":
+
+def _call_matches(
+    call: object,
+    *,
+    assistant_id: str,
+    target_number: str,
+    window: Optional[_MatchWindow] = None,
+    summary: Optional[_CallSummary] = None,
+) -> bool:
+    """Return True if the call matches the assistant/number/time constraints.
+
+    ``window`` comes from `_match_window`, built once per search rather than per
+    call. Callers that already summarised the call (see `_summarize_call`) can
+    pass ``summary`` to avoid reading the filter fields off the SDK model again.
+    """
+    if summary is None:
+        summary = _summarize_call(call)
+    if (
+        summary is None
+        or summary.status != "ended"
+        or summary.assistant_id != assistant_id
+        or summary.customer_number != target_number
+    ):
         return False
 
-    call_time: Optional[datetime] = None
-    if base_time is not None:
-        call_time = (
-            parse_vapi_datetime(getattr(call, "ended_at", None))
-            or parse_vapi_datetime(getattr(call, "started_at", None))
-        )
-        if not call_time:
+    if window is not None:
+        call_epoch = _epoch_seconds(getattr(call, "ended_at", None))
+        if call_epoch is None:
+            call_epoch = _epoch_seconds(getattr(call, "started_at", None))
+        if call_epoch is None:
             return False
 
-        comparison_time = base_time
-        if comparison_time.tzinfo is None:
-            comparison_time = comparison_time.replace(tzinfo=timezone.utc)
-        if call_time.tzinfo is None:
-            call_time = call_time.replace(tzinfo=timezone.utc)
-
-        same_day = call_time.astimezone(comparison_time.tzinfo).date() == comparison_time.date()
-        if not same_day:
+        if (
+            window.tolerance_seconds is not None
+            and abs(call_epoch - window.base_epoch) > window.tolerance_seconds
+        ):
             return False
 
-        if time_tolerance is not None:
-            within_tolerance = (
-                abs((call_time - comparison_time).total_seconds()) <= time_tolerance.total_seconds()
-            )
-            if not within_tolerance:
-                return False
+        if not window.day_start_epoch <= call_epoch < window.day_end_epoch:
+            return False
 
-    artifact = getattr(call, "artifact", None)
-    structured_outputs = getattr(artifact, "structured_outputs", {}) if artifact else {}
-    return bool(structured_outputs)
+    # The list endpoint returns full call objects, so the artifact is inspected
+    # directly and matching entries need no follow-up `calls.get`.
+    return bool(structured_outputs_of(call))
 
 
 def wait_for_structured_output(
@@ -90,8 +269,10 @@ def wait_for_structured_output(
     *,
     assistant_id: str,
     target_number: str,
+    phone_number_id: Optional[str] = None,
     base_time: Optional[datetime] = None,
     poll_interval: float = 5.0,
+    max_poll_interval: float = 60.0,
     timeout: timedelta = timedelta(minutes=5),
     time_tolerance: timedelta = timedelta(hours=2),
 ) -> Optional[object]:
@@ -101,9 +282,14 @@ def wait_for_structured_output(
         client: The Vapi client instance.
         assistant_id: Assistant identifier to filter by.
         target_number: Phone number associated with the call.
+        phone_number_id: Optional Vapi phone number the call was placed from.
         base_time: Timestamp the polling centres around (defaults to now in UTC).
-        poll_interval: Seconds to wait between list calls.
-        timeout: Maximum total time to wait before giving up. Use ``None`` for no timeout.
+        poll_interval: Seconds to wait between list calls while the listed calls change.
+        max_poll_interval: Cap for the wait, which doubles after every poll in which
+            the listed calls (ids, statuses, etc.) did not change and no call that
+            just ended is still waiting for its structured output.
+        timeout: Maximum total time to wait before giving up (the last sleep is cut
+            short to end at the deadline). Use ``None`` for no timeout.
         time_tolerance: Acceptable delta from ``base_time`` for the call.
 
     Returns:
@@ -117,6 +303,11 @@ def wait_for_structured_output(
     if timeout is not None:
         deadline = time.monotonic() + timeout.total_seconds()
 
+    window = _match_window(comparison_time, time_tolerance)
+    backoff_cap = max(poll_interval, max_poll_interval)
+    delay = poll_interval
+    previous_snapshot: Optional[Tuple[Optional[_CallSummary], ...]] = None
+
     attempt = 0
     while True:
         attempt += 1
@@ -125,52 +316,89 @@ def wait_for_structured_output(
             f"({assistant_id=}, {target_number=})"
         )
 
-        calls_list = client.calls.list()
+        candidates = iter_candidate_calls(
+            client,
+            assistant_id=assistant_id,
+            phone_number_id=phone_number_id,
+            base_time=comparison_time,
+            time_tolerance=time_tolerance,
+        )
 
-        for entry in calls_list:
+        snapshot = []
+        awaiting_artifact = False
+        now_epoch = time.time()
+        for entry in candidates:
+            summary = _summarize_call(entry)
+            snapshot.append(summary)
             if _call_matches(
                 entry,
                 assistant_id=assistant_id,
                 target_number=target_number,
-                base_time=comparison_time,
-                time_tolerance=time_tolerance,
+                window=window,
+                summary=summary,
             ):
-                full_call = client.calls.get(id=getattr(entry, "id", None))
-                artifact = getattr(full_call, "artifact", None)
-                structured_outputs = getattr(artifact, "structured_outputs", {}) if artifact else {}
-                if structured_outputs:
-                    print(
-                        "[VapiPolling] Structured output found for call "
-                        f"{getattr(full_call, 'id', 'unknown')} at "
-                        f"{getattr(full_call, 'ended_at', getattr(full_call, 'started_at', 'unknown'))}"
-                    )
-                    return full_call
+                print(
+                    "[VapiPolling] Structured output found for call "
+                    f"{getattr(entry, 'id', 'unknown')} at "
+                    f"{getattr(entry, 'ended_at', getattr(entry, 'started_at', 'unknown'))}"
+                )
+                return entry
+            if not awaiting_artifact:
+                awaiting_artifact = _awaiting_artifact(
+                    entry,
+                    summary,
+                    assistant_id=assistant_id,
+                    target_number=target_number,
+                    now_epoch=now_epoch,
+                )
 
         if deadline is not None and time.monotonic() >= deadline:
             print("[VapiPolling] Timeout reached while waiting for structured output.")
             return None
 
-        print(f"[VapiPolling] No matching structured output yet; sleeping {poll_interval} seconds.")
-        time.sleep(poll_interval)
+        # Back off while nothing changes; poll at the base rate again as soon as a
+        # call appears or changes status, and for as long as a call that just
+        # ended is listed without its artifact, since the artifact follows soon.
+        current_snapshot = tuple(snapshot)
+        if awaiting_artifact:
+            delay = poll_interval
+        elif previous_snapshot is not None:
+            if current_snapshot == previous_snapshot:
+                delay = min(delay * 2, backoff_cap)
+            else:
+                delay = poll_interval
+        previous_snapshot = current_snapshot
+
+        # Never sleep past the deadline, so the final poll happens on time.
+        sleep_for = delay
+        if deadline is not None:
+            sleep_for = max(min(delay, deadline - time.monotonic()), 0.0)
+
+        print(f"[VapiPolling] No matching structured output yet; sleeping {round(sleep_for, 1)} seconds.")
+        time.sleep(sleep_for)
 
 
 def _parse_number(value: Optional[str], default: float) -> float:
-    if value is None:
-        return default
     try:
         return float(value)
-    except ValueError:
-        print(f"[VapiPolling] Invalid numeric value '{value}'; falling back to {default}.")
+    except (TypeError, ValueError):
+        if value is not None:
+            print(f"[VapiPolling] Invalid numeric value '{value}'; falling back to {default}.")
         return default
 
 
+@functools.lru_cache(maxsize=1)
 def load_polling_configuration(
     *,
     poll_interval_default: float = 5.0,
     timeout_default_seconds: float = 0.0,
     tolerance_default_minutes: float = 120.0,
 ) -> Tuple[float, Optional[timedelta], timedelta]:
-    """Load polling cadence/tolerance values from environment variables."""
+    """Load polling cadence/tolerance values from environment variables.
+
+    The environment is read once per process; later calls return the same
+    values even if the environment changes mid-run.
+    """
     poll_interval = max(1.0, _parse_number(os.environ.get("VAPI_POLL_INTERVAL_SECONDS"), poll_interval_default))
     timeout_seconds = _parse_number(os.environ.get("VAPI_POLL_TIMEOUT_SECONDS"), timeout_default_seconds)
     tolerance_minutes = max(
@@ -227,22 +455,25 @@ def find_structured_call(
     *,
     assistant_id: str,
     target_number: str,
+    phone_number_id: Optional[str] = None,
     base_time: Optional[datetime] = None,
     time_tolerance: Optional[timedelta] = None,
 ) -> Optional[object]:
     """Return the most recent call with structured outputs matching the filter."""
-    calls_list = client.calls.list()
-    for entry in calls_list:
+    window = _match_window(base_time, time_tolerance)
+    candidates = iter_candidate_calls(
+        client,
+        assistant_id=assistant_id,
+        phone_number_id=phone_number_id,
+        base_time=base_time,
+        time_tolerance=time_tolerance,
+    )
+    for entry in candidates:
         if _call_matches(
             entry,
             assistant_id=assistant_id,
             target_number=target_number,
-            base_time=base_time,
-            time_tolerance=time_tolerance,
+            window=window,
         ):
-            full_call = client.calls.get(id=getattr(entry, "id", None))
-            artifact = getattr(full_call, "artifact", None)
-            structured_outputs = getattr(artifact, "structured_outputs", {}) if artifact else {}
-            if structured_outputs:
-                return full_call
+            return entry
     return None